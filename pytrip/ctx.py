@@ -65,7 +65,7 @@ class CtxCube(Cube):
             data = np.array(dcm["images"][i].pixel_array) * slope + intersect
             self.cube[i][:][:] = data
         if len(self.slice_pos) > 1 and self.slice_pos[1] < self.slice_pos[0]:
-            self.slice_pos.reverse()
+            self.slice_pos = self.slice_pos[::-1]
             self.zoffset = self.slice_pos[0]
             self.cube = self.cube[::-1]
 
@@ -137,9 +137,7 @@ class CtxCube(Cube):
             _ds.SOPInstanceUID = current_sop_uid
             _ds.SliceLocation = str(self.slice_pos[i])
             _ds.InstanceNumber = str(i + 1)
-            pixel_array = np.zeros((_ds.Rows, _ds.Columns), dtype=self.pydata_type)
-            pixel_array[:][:] = self.cube[i][:][:]
-            _ds.PixelData = pixel_array.tostring()
+            _ds.PixelData = np.ascontiguousarray(self.cube[i], dtype=self.pydata_type).tobytes()
             data.append(_ds)
         return data
 
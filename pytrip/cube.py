@@ -21,10 +21,10 @@ This module provides the Cube class, which is used by the CTX, DOS, LET and VDX
 A cube is a 3D object holding data, such as CT Hounsfield units, Dose- or LET values.
 """
 import os
-import re
 import sys
 import logging
 import datetime
+import itertools
 
 import numpy as np
 
@@ -48,6 +48,41 @@ from pytrip.util import TRiP98FilePath, TRiP98FileLocator
 logger = logging.getLogger(__name__)
 
 
+def _rasterize_rows(intersections, offsets, x_pos):
+    """ Even-odd (ray casting) test of voxel centres against contour intersections, for many rows at once.
+
+    A voxel is inside the contours if an odd number of intersections lies left of its centre.
+
+    :param intersections: sorted x-coordinates of contour intersections of all rows, concatenated into one array
+    :param offsets: array of length (number of rows + 1), intersections of row i are
+        intersections[offsets[i]:offsets[i + 1]]
+    :param x_pos: sorted x-coordinates of the voxel centres along a row
+    :returns: boolean array of shape (number of rows, len(x_pos)), True for voxels inside the contours.
+    """
+    no_of_rows = len(offsets) - 1
+    row_index = np.repeat(np.arange(no_of_rows), np.diff(offsets))
+    # the parity flips at the first voxel having its centre right of an intersection
+    first_voxel = np.searchsorted(x_pos, intersections, side='right')
+    flips = np.zeros((no_of_rows, len(x_pos) + 1), dtype=bool)
+    np.logical_xor.at(flips, (row_index, first_voxel), True)
+    return np.logical_xor.accumulate(flips[:, :-1], axis=1)
+
+
+def _version_tuple(version):
+    """ Converts a version string, such as "1.4" or "1.4a", to a tuple of integers which can be compared.
+
+    Only the leading digits of each dot separated component are used.
+    Conversion stops at the first component not starting with a digit, e.g. "abc" gives an empty tuple.
+    """
+    numbers = []
+    for component in version.split('.'):
+        digits = "".join(itertools.takewhile(lambda char: char.isdigit(), component))
+        if not digits:
+            break
+        numbers.append(int(digits))
+    return tuple(numbers)
+
+
 class Cube(object):
     """ Top level class for 3-dimensional data cubes used by e.g. DosCube, CtxCube and LETCube.
     Otherwise, this cube class may be used for storing different kinds of data, such as number of cells,
@@ -58,6 +93,70 @@ class Cube(object):
     data_file_extension = None
     allowed_suffix = tuple()
 
+    _default_user = None  # login name of the current user, used as default for created_by
+
+    # keywords of TRiP98 header which hold a single value, and the types they are converted to
+    # keywords are also names of the attributes the values are stored in
+    _header_field_types = {
+        "version": str,
+        "modality": str,
+        "primary_view": str,
+        "data_type": str,
+        "num_bytes": int,
+        "byte_order": str,
+        "patient_name": str,
+        "slice_dimension": int,
+        "pixel_size": float,
+        "slice_distance": float,
+        "slice_number": int,
+        "xoffset": int,
+        "yoffset": int,
+        "zoffset": int,
+        "dimx": int,
+        "dimy": int,
+        "dimz": int,
+    }
+
+    # TRiP98 data_type and num_bytes for numpy types, keyed by (dtype kind, dtype size in bytes)
+    _data_types = {
+        ('i', 1): ("integer", 1),
+        ('u', 1): ("integer", 1),
+        ('i', 2): ("integer", 2),
+        ('u', 2): ("integer", 2),
+        ('i', 4): ("integer", 4),
+        ('u', 4): ("integer", 4),
+        ('f', 4): ("float", 4),
+        ('f', 8): ("double", 8),
+    }
+
+    # struct format characters and numpy types of the data file, keyed by TRiP98 (data_type, num_bytes)
+    _format_types = {
+        ("integer", 1): ("b", np.int8),
+        ("integer", 2): ("h", np.int16),
+        ("integer", 4): ("i", np.int32),
+        ("float", 4): ("f", np.float32),
+        ("float", 8): ("d", np.double),
+        ("double", 4): ("f", np.float32),
+        ("double", 8): ("d", np.double),
+    }
+
+    # fixed part of the TRiP98 header, written by _write_trip_header
+    _header_template = ("primary_view {primary_view}\n"
+                        "data_type {data_type}\n"
+                        "num_bytes {num_bytes}\n"
+                        "byte_order {byte_order}\n"
+                        "patient_name {patient_name:s}\n"
+                        "slice_dimension {slice_dimension:d}\n"
+                        "pixel_size {pixel_size:.7f}\n"
+                        "slice_distance {slice_distance:.7f}\n"
+                        "slice_number {slice_number}\n"
+                        "xoffset {xoffset:d}\n"
+                        "dimx {dimx:d}\n"
+                        "yoffset {yoffset:d}\n"
+                        "dimy {dimy:d}\n"
+                        "zoffset 0\n"
+                        "dimz {dimz}\n")
+
     def __init__(self, cube=None):
         if cube is not None:  # copying constructor
             self.header_set = cube.header_set
@@ -95,16 +194,22 @@ class Cube(object):
             # unique for each CT slice
             self._ct_sop_instance_uid = cube._ct_sop_instance_uid
 
+            # np.zeros is as cheap as np.empty here (memory is zeroed lazily by the OS),
+            # and callers such as mask_by_voi() rely on a zero initialized cube
             self.cube = np.zeros((self.dimz, self.dimy, self.dimx), dtype=cube.pydata_type)
 
         else:
-            import getpass
             from pytrip import __version__ as _ptversion
 
+            # looking up the user name may involve querying the password database, do it only once
+            if Cube._default_user is None:
+                import getpass
+                Cube._default_user = getpass.getuser()
+
             self.header_set = False
             self.version = "2.0"
             self.modality = "CT"
-            self.created_by = getpass.getuser()
+            self.created_by = Cube._default_user
             self.creation_info = "Created with PyTRiP98 {:s}".format(_ptversion)
             self.primary_view = "transversal"  # e.g. transversal
             self.data_type = ""
@@ -123,7 +228,7 @@ class Cube(object):
             self.dimy = ""
             self.zoffset = 0.0
             self.dimz = ""
-            self.slice_pos = []
+            self.slice_pos = np.array([])
             self.basename = ""
 
             # UIDs unique for whole structure set
@@ -135,49 +240,69 @@ class Cube(object):
             # unique for each CT slice
             self._ct_sop_instance_uid = uid.generate_uid(prefix=None)
 
-            self.z_table = False  # positions are stored in self.slice_pos (list of slice#,pos(mm),thickness(mm),tilt)
+            self.z_table = False  # positions are stored in self.slice_pos (array of slice positions in mm)
 
     def __add__(self, other):
         """ Overload + operator
+
+        When adding a number, the result keeps the data type of the cube (integer overflow is not checked).
         """
         c = type(self)(self)
         if Cube in other.__class__.__bases__:
             c.cube = other.cube + self.cube
         else:
-            c.cube = self.cube + float(other)
+            # the copy constructor allocates c.cube with pydata_type, which may differ from the data type of self.cube
+            c.cube = np.empty_like(self.cube)
+            np.add(self.cube, float(other), out=c.cube, casting='unsafe')
         return c
 
     def __sub__(self, other):
         """ Overload - operator
+
+        When subtracting a number, the result keeps the data type of the cube (integer overflow is not checked).
         """
         c = type(self)(self)
         if Cube in other.__class__.__bases__:
             c.cube = self.cube - other.cube
         else:
-            c.cube = self.cube - float(other)
+            # the copy constructor allocates c.cube with pydata_type, which may differ from the data type of self.cube
+            c.cube = np.empty_like(self.cube)
+            np.subtract(self.cube, float(other), out=c.cube, casting='unsafe')
         return c
 
     def __mul__(self, other):
         """ Overload * operator
+
+        When multiplying by a number, the result keeps the data type of the cube (integer overflow is not checked).
         """
         c = type(self)(self)
         if Cube in other.__class__.__bases__:
             c.cube = other.cube * self.cube
         else:
-            t = type(c.cube[0, 0, 0])
-            c.cube = np.array(self.cube * float(other), dtype=t)
+            c.cube = np.empty_like(self.cube)  # same data type as self.cube, see __add__
+            np.multiply(self.cube, float(other), out=c.cube, casting='unsafe')
         return c
 
     def __div__(self, other):
         """ Overload / operator
+
+        Voxels where the divisor is zero are set to zero.
+        When dividing by a number, the result keeps the data type of the cube.
         """
         c = type(self)(self)
         if Cube in other.__class__.__bases__:
-            c.cube = self.cube / other.cube
+            # true division, integer cubes are divided to floating point numbers
+            dtype = np.result_type(self.cube, other.cube)
+            if dtype.kind != 'f':
+                dtype = np.float64
+            c.cube = np.zeros(self.cube.shape, dtype=dtype)
+            np.divide(self.cube, other.cube, out=c.cube, where=(other.cube != 0))  # fix division by zero
         else:
-            t = type(c.cube[0, 0, 0])
-            c.cube = np.array(self.cube / float(other), dtype=t)
-        c.cube[np.isnan(c.cube)] = 0  # fix division by zero NaNs
+            c.cube = np.empty_like(self.cube)  # same data type as self.cube, see __add__
+            if float(other) == 0:
+                c.cube.fill(0)  # fix division by zero
+            else:
+                np.divide(self.cube, float(other), out=c.cube, casting='unsafe')
         return c
 
     __truediv__ = __div__
@@ -209,18 +334,8 @@ class Cube(object):
         """
         eps = 1e-5
 
-        if a.dimx != b.dimx:
-            return False
-        elif a.dimy != b.dimy:
-            return False
-        elif a.dimz != b.dimz:
-            return False
-        elif (a.pixel_size - b.pixel_size) > eps:
-            return False
-        elif a.slice_distance != b.slice_distance:
-            return False
-        else:
-            return True
+        return ((a.dimx, a.dimy, a.dimz, a.slice_distance) == (b.dimx, b.dimy, b.dimz, b.slice_distance) and
+                abs(a.pixel_size - b.pixel_size) <= eps)
 
     def indices_to_pos(self, indices):
         """ Translate index number of a voxel to real position in [mm], including any offsets.
@@ -230,16 +345,10 @@ class Cube(object):
         :params [int] indices: tuple or list of integer indices (i,j,k) or [i,j,k]
         :returns: list of positions, including offsets, as a list of floats [x,y,z]
         """
-        pos = [(indices[0] + 0.5) * self.pixel_size + self.xoffset,
-               (indices[1] + 0.5) * self.pixel_size + self.yoffset,
-               self.slice_pos[indices[2]]]
-        logger.debug("Map [i,j,k] {:d} {:d} {:d} to [x,y,z] {:.2f} {:.2f} {:.2f}".format(indices[0],
-                                                                                         indices[1],
-                                                                                         indices[2],
-                                                                                         pos[0],
-                                                                                         pos[1],
-                                                                                         pos[2]))
-        return pos
+        # no logging here, this method is called for each row of the cube when masking by VOI
+        return [(indices[0] + 0.5) * self.pixel_size + self.xoffset,
+                (indices[1] + 0.5) * self.pixel_size + self.yoffset,
+                self.slice_pos[indices[2]]]
 
     def slice_to_z(self, slice_number):
         """ Return z-position in [mm] of slice number (starting at 1).
@@ -260,9 +369,39 @@ class Cube(object):
         # eq = util.evaluator(equation)
         # TODO why data not being used ?
         # data = np.array(np.zeros((self.dimz, self.dimy, self.dimx)))
-        x = np.linspace(0.5, self.dimx - 0.5, self.dimx) * self.pixel_size - center[0]
-        y = np.linspace(self.dimx - 0.5, 0.5, self.dimx) * self.pixel_size - center[1]
-        xv, yv = np.meshgrid(x, y)
+        # single precision is sufficient for voxel positions, sparse meshgrid avoids materializing 2D grids
+        x = (np.arange(self.dimx, dtype=np.float32) + 0.5) * self.pixel_size - center[0]
+        y = (np.arange(self.dimy - 1, -1, -1, dtype=np.float32) + 0.5) * self.pixel_size - center[1]
+        xv, yv = np.meshgrid(x, y, sparse=True, copy=False)
+
+    def _compute_voi_mask(self, voi):
+        """ Finds the voxels of the cube which are located within the given Voi.
+
+        :param Voi voi: the volume of interest
+        :returns: boolean array of the cube shape, True for voxels inside the contour.
+        """
+        mask = np.zeros((self.dimz, self.dimy, self.dimx), dtype=bool)
+        rows = []  # (i_z, i_y) indices of rows crossing the contours
+        intersections = []  # sorted intersections for each of these rows
+        for i_z in range(self.dimz):
+            for i_y in range(self.dimy):
+                # For a line along y, figure out how many contour intersections there are,
+                # then check how many intersections there are with x < than current point.
+                # If the number is odd, then the point is inside the VOI.
+                # If the number is even, then the point is outisde the VOI.
+                # This algorithm also works with multiple disconnected contours.
+                intersection = voi.get_row_intersections(self.indices_to_pos([0, i_y, i_z]))
+                if intersection is None:
+                    break
+                if len(intersection) > 0:
+                    rows.append((i_z, i_y))
+                    intersections.append(intersection)
+        if rows:
+            offsets = np.cumsum([0] + [len(intersection) for intersection in intersections])
+            i_z, i_y = np.array(rows).T
+            x_pos = (np.arange(self.dimx) + 0.5) * self.pixel_size + self.xoffset  # x positions of voxel centres
+            mask[i_z, i_y] = _rasterize_rows(np.concatenate(intersections), offsets, x_pos)
+        return mask
 
     def mask_by_voi_all(self, voi, preset=0, data_type=np.int16):
         """ Attaches/overwrites Cube.data based on a given Voi.
@@ -273,31 +412,10 @@ class Cube(object):
         :param Voi voi: the volume of interest
         :param int preset: value to be assigned to the voxels within the contour.
         :param data_type: numpy data type, default is np.int16
-
-        TODO: this needs some faster implementation.
         """
-        data = np.array(np.zeros((self.dimz, self.dimy, self.dimx)), dtype=data_type)
+        data = np.zeros((self.dimz, self.dimy, self.dimx), dtype=data_type)
         if preset != 0:
-            for i_z in range(self.dimz):
-                for i_y in range(self.dimy):
-                    # For a line along y, figure out how many contour intersections there are,
-                    # then check how many intersections there are with x < than current point.
-                    # If the number is odd, then the point is inside the VOI.
-                    # If the number is even, then the point is outisde the VOI.
-                    # This algorithm also works with multiple disconnected contours.
-                    intersection = voi.get_row_intersections(self.indices_to_pos([0, i_y, i_z]))
-                    if intersection is None:
-                        break
-                    if len(intersection) > 0:
-                        k = 0
-                        for i_x in range(self.dimx):
-                            # count the number of intersections k along y, where intersection_x < current x position
-                            if self.indices_to_pos([i_x, 0, 0])[0] > intersection[k]:
-                                k += 1
-                                if k >= len(intersection):
-                                    break
-                            if k % 2 == 1:  # voxel is inside structure, if odd number of intersections.
-                                data[i_z][i_y][i_x] = preset
+            data[self._compute_voi_mask(voi)] = preset
         self.cube = data
 
     def create_empty_cube(self, value, dimx, dimy, dimz, pixel_size, slice_distance, slice_offset=0.0):
@@ -320,12 +438,12 @@ class Cube(object):
         self.pixel_size = pixel_size
         self.slice_distance = slice_distance
         self.slice_thickness = slice_distance  # use distance for thickness as default
-        self.cube = np.ones((dimz, dimy, dimx), dtype=np.int16) * value
+        self.cube = np.full((dimz, dimy, dimx), value, dtype=np.int16)
         self.slice_dimension = dimx
         self.num_bytes = 2
         self.data_type = "integer"
         self.pydata_type = np.int16
-        self.slice_pos = [slice_distance * i + slice_offset for i in range(dimz)]
+        self.slice_pos = np.arange(dimz, dtype=np.float64) * slice_distance + slice_offset
         self.header_set = True
         self.patient_id = ''
         # UIDs unique for whole structure set
@@ -345,20 +463,7 @@ class Cube(object):
         :param Voi voi: the volume of interest
         :param value=0: value to be assigned to the voxels within the contour.
         """
-        for i_z in range(self.dimz):
-            for i_y in range(self.dimy):
-                intersection = voi.get_row_intersections(self.indices_to_pos([0, i_y, i_z]))
-                if intersection is None:
-                    break
-                if len(intersection) > 0:
-                    k = 0
-                    for i_x in range(self.dimx):
-                        if self.indices_to_pos([i_x, 0, 0])[0] > intersection[k]:
-                            k += 1
-                            if k >= (len(intersection)):
-                                break
-                        if k % 2 == 1:  # voxel is inside structure, if odd number of intersections.
-                            self.cube[i_z][i_y][i_x] = value
+        self.cube[self._compute_voi_mask(voi)] = value
 
     def mask_by_voi_add(self, voi, value=0):
         """ Add 'value' to all voxels within the given Voi
@@ -369,26 +474,13 @@ class Cube(object):
         :param Voi voi: the volume of interest
         :param value=0: value to be added to the voxel values within the contour.
         """
-        for i_z in range(self.dimz):
-            for i_y in range(self.dimy):
-                intersection = voi.get_row_intersections(self.indices_to_pos([0, i_y, i_z]))
-                if intersection is None:
-                    break
-                if len(intersection) > 0:
-                    k = 0
-                    for i_x in range(self.dimx):
-                        if self.indices_to_pos([i_x, 0, 0])[0] > intersection[k]:
-                            k += 1
-                            if k >= (len(intersection)):
-                                break
-                        if k % 2 == 1:  # voxel is inside structure, if odd number of intersections.
-                            self.cube[i_z][i_y][i_x] += value
+        self.cube[self._compute_voi_mask(voi)] += value
 
     def merge(self, cube):
         self.cube = np.maximum(self.cube, cube.cube)
 
     def merge_zero(self, cube):
-        self.cube[self.cube == 0] = cube.cube[self.cube == 0]
+        np.copyto(self.cube, cube.cube, casting='unsafe', where=(self.cube == 0))
 
     # ######################  READING TRIP98 FILES #######################################
 
@@ -424,10 +516,10 @@ class Cube(object):
 
         # single argument of string type, i.e. filename without extension
         if path_string:
-            self.basename = os.path.basename(TRiP98FilePath(path, self).basename)
-
             path_locator = TRiP98FileLocator(path, self)
 
+            self.basename = os.path.basename(path_locator.trip98path.basename)
+
             header_path = path_locator.header
             datafile_path = path_locator.datafile
 
@@ -496,13 +588,12 @@ class Cube(object):
             fp = gzip.open(header_path, "rt")
         else:
             fp = open(header_path, "rt")
-        content = fp.read()
-        fp.close()
 
-        # fill self with data
-        self._parse_trip_header(content)
+        # fill self with data, lines are parsed as they are read from the file
+        with fp:
+            self._parse_trip_header(fp)
         self._set_format_str()
-        logger.debug("Format string:" + self.format_str)
+        logger.debug("Format string:%s", self.format_str)
 
     def _read_trip_data_file(self, datafile_path, header_path,
                              multiply_by_2=False):  # TODO: could be made private? #126
@@ -533,11 +624,17 @@ class Cube(object):
         logger.info("Opening file: " + datafile_path)
         if datafile_path.endswith('.gz'):
             import gzip
+            # decompress directly into a preallocated array, no intermediate bytes object needs to be copied
+            cube = np.empty(data_count, dtype=data_dtype)
+            buffer = memoryview(cube.view(np.uint8))
+            bytes_read = 0
             with gzip.open(datafile_path, "rb") as f:
-                s = f.read(data_dtype.itemsize * data_count)
-                tmpcube = np.frombuffer(s, dtype=data_dtype, count=data_count)
-                # frombuffer returns read-only array, so we need to make it writable
-                cube = np.require(tmpcube, dtype=data_dtype, requirements=['W', 'O'])
+                while bytes_read < len(buffer):
+                    chunk_size = f.readinto(buffer[bytes_read:])
+                    if not chunk_size:  # end of file
+                        break
+                    bytes_read += chunk_size
+            cube = cube[:bytes_read // data_dtype.itemsize]  # file may be shorter than expected
         else:
             cube = np.fromfile(datafile_path, dtype=data_dtype)
 
@@ -560,66 +657,39 @@ class Cube(object):
         cube = np.reshape(cube, (self.dimz, self.dimy, self.dimx))
         if multiply_by_2:
             logger.warning("Cube was previously rescaled to 50%. Now multiplying with 2.")
-            cube *= 2
+            if cube.dtype.kind in 'iu':
+                np.left_shift(cube, 1, out=cube)
+            else:
+                cube *= cube.dtype.type(2)
         self.cube = cube
 
     def _parse_trip_header(self, content):
         """ Parses content which was read from a trip header.
+
+        :param content: header as a string, or an iterable of its lines (i.e. an open file)
         """
-        i = 0
         self.header_set = True
-        content = content.split('\n')
         self.z_table = False
-        while i < len(content):
-            if re.match("version", content[i]):
-                self.version = content[i].split()[1]
-            if re.match("modality", content[i]):
-                self.modality = content[i].split()[1]
-            if re.match("created_by", content[i]):
-                self.created_by = content[i].replace("created_by ", "", 1)
-                self.created_by = self.created_by.rstrip()
-            if re.match("creation_info", content[i]):
-                self.creation_info = content[i].replace("creation_info ", "", 1)
-                self.creation_info = self.creation_info.rstrip()
-            if re.match("primary_view", content[i]):
-                self.primary_view = content[i].split()[1]
-            if re.match("data_type", content[i]):
-                self.data_type = content[i].split()[1]
-            if re.match("num_bytes", content[i]):
-                self.num_bytes = int(content[i].split()[1])
-            if re.match("byte_order", content[i]):
-                self.byte_order = content[i].split()[1]
-            if re.match("patient_name", content[i]):
-                self.patient_name = content[i].split()[1]
-            if re.match("slice_dimension", content[i]):
-                self.slice_dimension = int(content[i].split()[1])
-            if re.match("pixel_size", content[i]):
-                self.pixel_size = float(content[i].split()[1])
-            if re.match("slice_distance", content[i]):
-                self.slice_distance = float(content[i].split()[1])
-                self.slice_thickness = float(content[i].split()[1])  # TRiP format only. See #342
-            if re.match("slice_number", content[i]):
-                self.slice_number = int(content[i].split()[1])
-            if re.match("xoffset", content[i]):
-                self.xoffset = int(content[i].split()[1])
-            if re.match("yoffset", content[i]):
-                self.yoffset = int(content[i].split()[1])
-            if re.match("zoffset", content[i]):
-                self.zoffset = int(content[i].split()[1])
-            if re.match("dimx", content[i]):
-                self.dimx = int(content[i].split()[1])
-            if re.match("dimy", content[i]):
-                self.dimy = int(content[i].split()[1])
-            if re.match("dimz", content[i]):
-                self.dimz = int(content[i].split()[1])
-            if re.match("slice_no", content[i]):
-                self.slice_pos = [float(j) for j in range(self.slice_number)]
+        if isinstance(content, str):
+            content = content.split('\n')
+        lines = iter(content)
+        for line in lines:
+            tokens = line.split()
+            if not tokens:
+                continue
+            keyword = tokens[0]
+            if keyword in self._header_field_types:
+                setattr(self, keyword, self._header_field_types[keyword](tokens[1]))
+                if keyword == "slice_distance":
+                    self.slice_thickness = self.slice_distance  # TRiP format only. See #342
+            elif keyword in ("created_by", "creation_info"):
+                # value may contain spaces or be empty, take the rest of the line after "keyword "
+                setattr(self, keyword, line.lstrip()[len(keyword) + 1:].rstrip())
+            elif keyword == "slice_no":
+                # header of the z_table, followed by one line per slice
+                # position is the second column
+                self.slice_pos = np.loadtxt(itertools.islice(lines, self.slice_number), usecols=(1,), ndmin=1)
                 self.z_table = True
-                i += 1
-                for j in range(self.slice_number):
-                    self.slice_pos[j] = float(content[i].split()[1])
-                    i += 1
-            i += 1
 
         # zoffset from TRiP contains the integer amount of slice thicknesses as offset.
         # Here we convert to an actual offset in mm, which is stored in self
@@ -634,7 +704,7 @@ class Cube(object):
         # - ztable in .hed is _without_ offset
         # - self.slice_pos however holds values _including_ offset.
         if not self.z_table:
-            self.slice_pos = [self.zoffset + _i * self.slice_distance for _i in range(self.slice_number)]
+            self.slice_pos = np.arange(self.slice_number, dtype=np.float64) * self.slice_distance + self.zoffset
         self._set_format_str()
 
     def _set_format_str(self):
@@ -649,27 +719,13 @@ class Cube(object):
     def _set_number_of_bytes(self):
         """Set format_str and pydata_type according to num_bytes and data_type
         """
-        if self.data_type == "integer":
-            if self.num_bytes == 1:
-                self.format_str += "b"
-                self.pydata_type = np.int8
-            if self.num_bytes == 2:
-                self.format_str += "h"
-                self.pydata_type = np.int16
-            if self.num_bytes == 4:
-                self.format_str += "i"
-                self.pydata_type = np.int32
-        elif self.data_type in ["float", "double"]:
-            if self.num_bytes == 4:
-                self.format_str += "f"
-                self.pydata_type = np.float32
-            if self.num_bytes == 8:
-                self.format_str += "d"
-                self.pydata_type = np.double
-        else:
-            print("Format:", self.byte_order, self.data_type, self.num_bytes)
+        if (self.data_type, self.num_bytes) not in self._format_types:
+            logger.error("Unsupported format: byte_order=%s data_type=%s num_bytes=%s",
+                         self.byte_order, self.data_type, self.num_bytes)
             raise IOError("Unsupported format.")
-        logger.debug("self.format_str: '{}'".format(self.format_str))
+        format_char, self.pydata_type = self._format_types[(self.data_type, self.num_bytes)]
+        self.format_str += format_char
+        logger.debug("self.format_str: '%s'", self.format_str)
 
     # ######################  WRITING TRIP98 FILES #######################################
 
@@ -712,62 +768,77 @@ class Cube(object):
     def _write_trip_header(self, path):
         """ Write a TRiP98 formatted header file, based on the available meta data.
 
+        If the path ends with .gz, the header is gzip compressed.
+
         :param path: fully qualified path, including file extension (.hed)
         """
-        from distutils.version import LooseVersion
-        output_str = "version " + self.version + "\n"
-        output_str += "modality " + self.modality + "\n"
-        # include created_by and creation_info only for files newer than 1.4
-        if LooseVersion(self.version) >= LooseVersion("1.4"):
-            output_str += "created_by {:s}\n".format(self.created_by)
-            output_str += "creation_info {:s}\n".format(self.creation_info)
-        output_str += "primary_view " + self.primary_view + "\n"
-        output_str += "data_type " + self.data_type + "\n"
-        output_str += "num_bytes " + str(self.num_bytes) + "\n"
-        output_str += "byte_order " + self.byte_order + "\n"
         if self.patient_name == "":
             self.patient_name = "Anonymous"
-        # patient_name in .hed must be equal to the base filename without extension, else TRiP98 wont import VDX
-        _fname = os.path.basename(path)
-        _pname = os.path.splitext(_fname)[0]
-        output_str += "patient_name {:s}\n".format(_pname)
-        output_str += "slice_dimension {:d}\n".format(self.slice_dimension)
-        output_str += "pixel_size {:.7f}\n".format(self.pixel_size)
-        output_str += "slice_distance {:.7f}\n".format(self.slice_distance)
-        output_str += "slice_number " + str(self.slice_number) + "\n"
-        output_str += "xoffset {:d}\n".format(int(round(self.xoffset / self.pixel_size)))
-        output_str += "dimx {:d}\n".format(self.dimx)
-        output_str += "yoffset {:d}\n".format(int(round(self.yoffset / self.pixel_size)))
-        output_str += "dimy {:d}\n".format(self.dimy)
 
+        parts = ["version {}\nmodality {}\n".format(self.version, self.modality)]
+        # include created_by and creation_info only for files newer than 1.4 (or if version can't be parsed)
+        version = _version_tuple(self.version)
+        if not version or version >= (1, 4):
+            parts.append("created_by {:s}\ncreation_info {:s}\n".format(self.created_by, self.creation_info))
+
+        # patient_name in .hed must be equal to the base filename without extension, else TRiP98 wont import VDX
+        header_path = path[:-len(".gz")] if path.endswith(".gz") else path
         # zoffset in Voxelplan .hed seems to be broken, and should not be used if not = 0
         # to apply zoffset, z_table should be used instead.
         # This means, self.zoffset should not be used anywhere.
-        output_str += "zoffset 0\n"
-        output_str += "dimz " + str(self.dimz) + "\n"
+        parts.append(self._header_template.format(primary_view=self.primary_view,
+                                                  data_type=self.data_type,
+                                                  num_bytes=self.num_bytes,
+                                                  byte_order=self.byte_order,
+                                                  patient_name=os.path.splitext(os.path.basename(header_path))[0],
+                                                  slice_dimension=self.slice_dimension,
+                                                  pixel_size=self.pixel_size,
+                                                  slice_distance=self.slice_distance,
+                                                  slice_number=self.slice_number,
+                                                  xoffset=int(round(self.xoffset / self.pixel_size)),
+                                                  dimx=self.dimx,
+                                                  yoffset=int(round(self.yoffset / self.pixel_size)),
+                                                  dimy=self.dimy,
+                                                  dimz=self.dimz))
         if self.z_table:
-            output_str += "z_table yes\n"
-            output_str += "slice_no  position  thickness  gantry_tilt\n"
-            for i, item in enumerate(self.slice_pos):
-                output_str += "  {:<3d}{:14.4f}{:13.4f}{:14.4f}\n".format(i + 1, item,
-                                                                          self.slice_thickness, 0)  # 0 gantry tilt
+            parts.append("z_table yes\nslice_no  position  thickness  gantry_tilt\n")
+            # 0 gantry tilt
+            parts.extend("  {:<3d}{:14.4f}{:13.4f}{:14.4f}\n".format(i + 1, item, self.slice_thickness, 0)
+                         for i, item in enumerate(self.slice_pos))
         else:
-            output_str += "z_table no\n"
+            parts.append("z_table no\n")
 
-        with open(path, "w+") as f:
-            f.write(output_str)
+        if path.endswith(".gz"):
+            import gzip
+            fp = gzip.open(path, "wt")
+        else:
+            fp = open(path, "w+")
+        with fp:
+            fp.write("".join(parts))
 
     def _write_trip_data(self, path):
         """ Writes the binary data cube in TRiP98 format to a file.
 
         Type is specified by self.pydata_type and self.byte_order attributes.
+        If the path ends with .gz, the data is gzip compressed.
 
         :param str path: Full path including file extension.
         """
-        cube = np.array(self.cube, dtype=self.pydata_type)
+        # copies only if a cast is needed, or if the cube is a non-contiguous view (e.g. reversed along z),
+        # which tofile() would otherwise write element by element
+        cube = np.ascontiguousarray(self.cube, dtype=self.pydata_type)
         if self.byte_order == "aix":
-            cube = cube.byteswap()
-        cube.tofile(path)
+            if cube is self.cube:
+                cube = cube.byteswap()  # do not touch the data of this cube
+            else:
+                cube.byteswap(inplace=True)
+        if path.endswith(".gz"):
+            # compressed data file, as accepted by _read_trip_data_file
+            import gzip
+            with gzip.open(path, "wb") as f:
+                f.write(memoryview(cube.reshape(-1).view(np.uint8)))
+        else:
+            cube.tofile(path)
 
     # ######################  READING DICOM FILES #######################################
 
@@ -780,9 +851,9 @@ class Cube(object):
         # TODO: can we rely on that this will always be sorted?
         # if yes, then all references to whether this is sorted or not can be removed hereafter
         # (see also pytripgui) /NBassler
-        self.slice_pos = []
-        for i, dcm_image in enumerate(dcm["images"]):
-            self.slice_pos.append(float(dcm_image.ImagePositionPatient[2]))
+        images = dcm["images"]
+        self.slice_pos = np.fromiter((dcm_image.ImagePositionPatient[2] for dcm_image in images),
+                                     dtype=np.float64, count=len(images))
 
     def _set_header_from_dicom(self, dcm):
         """ Creates the header metadata for this Cube class, based on a given Dicom object.
@@ -796,7 +867,7 @@ class Cube(object):
         self.created_by = "pytrip"
         self.creation_info = "Created by PyTRiP98;"
         self.primary_view = "transversal"
-        self.set_data_type(type(ds.pixel_array[0][0]))
+        self.set_data_type(ds.pixel_array.dtype.type)
         self.patient_name = ds.PatientName
         self.basename = ds.PatientID.replace(" ", "_")
         self.slice_dimension = int(ds.Rows)  # should be changed ?
@@ -817,7 +888,7 @@ class Cube(object):
         # TODO: slice_distance should probably be a list of distances,
         # but for now we will just use the distance between the first two slices.
         if len(self.slice_pos) > 1:  # _set_z_table_from_dicom() must be called before
-            self.slice_distance = abs(self.slice_pos[1] - self.slice_pos[0])
+            self.slice_distance = abs(float(self.slice_pos[1] - self.slice_pos[0]))
             logger.debug("Slice distance set to {:.2f}".format(self.slice_distance))
         else:
             logger.warning("Only a single slice found. Setting slice_distance to slice_thickness.")
@@ -860,23 +931,13 @@ class Cube(object):
     def set_data_type(self, type):
         """ Sets the data type for the TRiP98 header files.
 
+        Types without a TRiP98 counterpart (e.g. np.int64) leave the header unchanged.
+
         :param numpy.type type: numpy type, e.g. np.uint16
         """
-        if type is np.int8 or type is np.uint8:
-            self.data_type = "integer"
-            self.num_bytes = 1
-        elif type is np.int16 or type is np.uint16:
-            self.data_type = "integer"
-            self.num_bytes = 2
-        elif type is np.int32 or type is np.uint32:
-            self.data_type = "integer"
-            self.num_bytes = 4
-        elif type is np.float:
-            self.data_type = "float"
-            self.num_bytes = 4
-        elif type is np.double:
-            self.data_type = "double"
-            self.num_bytes = 8
+        dtype = np.dtype(type)
+        if (dtype.kind, dtype.itemsize) in self._data_types:
+            self.data_type, self.num_bytes = self._data_types[(dtype.kind, dtype.itemsize)]
 
     # ######################  WRITING DICOM FILES #######################################
 
@@ -32,7 +32,7 @@ def compare_dicom_key(dcm):
     return float(dcm.ImagePositionPatient[2])
 
 
-def read_dicom_dir(dicom_dir):
+def read_dicom_dir(dicom_dir, stop_before_pixels=False):
     """ Reads a directory with dicom files.
     Identifies each dicom file with .dcm suffix and returns a dict containing a dicom object.
     Dicom object may be "CT", "RTSTRUCT", "RTDOSE" or "RTPLAN".
@@ -40,6 +40,9 @@ def read_dicom_dir(dicom_dir):
     CT objects are lists of images. They will be sorted by the position in patient given
     by the ImagePositionPatient[2] tag.
 
+    :param str dicom_dir: path to directory with dicom files
+    :param bool stop_before_pixels: if True, pixel data is not read. Faster when only metadata is needed,
+        but the returned objects cannot be used to import CT or dose cubes.
     :returns: A dict containing dicom objects and corresponding keys 'images','rtss','rtdose' or 'rtplan'.
     """
     if not os.path.isdir(dicom_dir):
@@ -53,7 +56,7 @@ def read_dicom_dir(dicom_dir):
     _files = os.listdir(dicom_dir)
     for item in _files:
         if os.path.splitext(item)[1].lower() in dicom_suffix:
-            dcm = dicom.read_file(os.path.join(dicom_dir, item), force=True)
+            dcm = dicom.read_file(os.path.join(dicom_dir, item), force=True, stop_before_pixels=stop_before_pixels)
             # TODO figureout what was it about (see below)
             # if dicom.__version__ >= "0.9.5":
             # dcm = dicom.read_file(os.path.join(dicom_dir, item), force=True)
@@ -46,6 +46,10 @@ from pytrip.cube import Cube
 from pytrip.error import InputError, ModuleNotLoadedError
 from pytrip import pytriplib
 
+# dose values [in TRiP98 units, target dose = 1000] of the DVH bins in DosCube.calculate_dvh(), shared by all calls
+_DVH_X = np.arange(start=0.0, stop=1500.0)
+_DVH_X.flags.writeable = False
+
 
 class DosCube(Cube):
     """ Class for handling Dose data. In TRiP98 these are stored in VOXELPLAN format with the .dos/.DOS suffix.
@@ -82,8 +86,8 @@ class DosCube(Cube):
         if self.header_set is False:
             self._set_header_from_dicom(dcm)
         self.cube = np.zeros((self.dimz, self.dimy, self.dimx))
-        for i, item in enumerate(dcm["rtdose"].pixel_array):
-            self.cube[i][:][:] = item
+        # single copy of all frames, raises ValueError if the pixel data doesn't match the header dimensions
+        self.cube[...] = dcm["rtdose"].pixel_array
 
     def calculate_dvh(self, voi):
         """
@@ -99,27 +103,29 @@ class DosCube(Cube):
             "The function calculate_dvh is deprecated, and is replaced with the pytrip.VolHist object.",
             DeprecationWarning
         )
-        z_pos = 0  # z position
         voxel_size = np.array([self.pixel_size, self.pixel_size, self.slice_distance])
         # in TRiP98 dose is stored in relative numbers, target dose is set to 1000 (and stored as 2-bytes ints)
         maximum_dose = 1500  # do not change, same value is hardcoded in filter_point.c (calculate_dvh_slice method)
         dose_bins = np.zeros(maximum_dose)  # placeholder for DVH, filled with zeros
         voi_and_cube_intersect = False
-        for i in range(self.dimz):
-            z_pos += self.slice_distance
-            slice = voi.get_slice_at_pos(z_pos)
-            if slice is not None:   # VOI intersects with this slice
-                voi_and_cube_intersect = True
-                dose_bins += pytriplib.calculate_dvh_slice(self.cube[i],
-                                                           np.array(slice.contours[0].contour),
-                                                           voxel_size)
+
+        # match all cube slices against all VOI slices at once, same criterion as in Voi.get_slice_at_pos()
+        z_pos = np.cumsum(np.full(self.dimz, self.slice_distance))  # z position of each cube slice
+        voi_pos = np.array([item.get_position() for item in voi.slices])
+        voi_half_thickness = np.array([item.thickness * 0.5 for item in voi.slices])
+        matching = np.isclose(voi_pos, z_pos[:, np.newaxis], atol=voi_half_thickness)
+        for i in np.flatnonzero(matching.any(axis=1)):  # VOI intersects with these slices
+            voi_and_cube_intersect = True
+            slice = voi.slices[np.argmax(matching[i])]  # first matching VOI slice
+            dose_bins += pytriplib.calculate_dvh_slice(self.cube[i],
+                                                       np.array(slice.contours[0].contour),
+                                                       voxel_size)
 
         if voi_and_cube_intersect:
-            sum_of_doses = sum(dose_bins)
+            sum_of_doses = float(dose_bins.sum())
             # np.cumsum - cumulative sum of array along the axis
             # we calculate is backwards and revert to get a plot which is monotonically decreasing
             # normalization is needed to get maximum values on Y axis to be <= 1
-            dvh_x = np.arange(start=0.0, stop=1500.0)
             dvh_y = np.cumsum(dose_bins[::-1])[::-1] / sum_of_doses
 
             min_dose = np.where(dvh_y >= 0.98)[0][-1]
@@ -129,7 +135,7 @@ class DosCube(Cube):
             #   f_i = dose_bin(i) / \sum_i dose_bin(i)  - frequency of dose at index i
             #   d_i = dvx_i(i) = i                      - dose at index i (equal to i)
             #             dose goes from 0 to 1500 and is integer
-            mean_dose = np.dot(dose_bins, dvh_x) / sum_of_doses
+            mean_dose = np.dot(dose_bins, _DVH_X) / sum_of_doses
 
             # if full voi is irradiated with target dose, then it should be equal to VOI volume
             mean_volume = sum_of_doses * voxel_size[0] * voxel_size[1] * voxel_size[2]
@@ -139,9 +145,8 @@ class DosCube(Cube):
             max_dose /= 1000.0
             mean_dose /= 1000.0
             mean_volume /= 1000.0
-            dvh_x /= 1000.0
 
-            dvh = np.column_stack((dvh_x, dvh_y))
+            dvh = np.column_stack((_DVH_X / 1000.0, dvh_y))
 
             return dvh, min_dose, max_dose, mean_dose, mean_volume
         return None
@@ -246,7 +251,7 @@ class DosCube(Cube):
         ds.PixelRepresentation = 0
         ds.StudyID = '1'
         ds.SeriesNumber = '14'  # SeriesNumber tag 0x0020,0x0011 (type IS - Integer String)
-        ds.GridFrameOffsetVector = [x * self.slice_distance for x in range(self.dimz)]
+        ds.GridFrameOffsetVector = (np.arange(self.dimz, dtype=np.float64) * self.slice_distance).tolist()
         ds.InstanceNumber = ''
         ds.PositionReferenceIndicator = "RF"
         ds.TissueHeterogeneityCorrection = ['IMAGE', 'ROI_OVERRIDE']
@@ -271,9 +276,7 @@ class DosCube(Cube):
         rt_set.RefdSOPClassUID = '1.2.840.10008.5.1.4.1.1.481.5'
         rt_set.RefdSOPInstanceUID = '1.2.3'
         ds.ReferencedRTPlanSequence = Sequence([rt_set])
-        pixel_array = np.zeros((len(self.cube), ds.Rows, ds.Columns), dtype=self.pydata_type)
-        pixel_array[:][:][:] = self.cube[:][:][:]
-        ds.PixelData = pixel_array.tostring()
+        ds.PixelData = np.ascontiguousarray(self.cube, dtype=self.pydata_type).tobytes()
         return ds
 
     def write_dicom(self, directory):
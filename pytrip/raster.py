@@ -21,6 +21,8 @@ This module provides the top-level Rst class which can handle accelerator contro
 It also provides the SubMachine class which treats individual energy layers.
 """
 import logging
+from operator import itemgetter
+
 import numpy as np
 try:
     import pydicom as dicom  # as of version 1.0 pydicom package should be used this way
@@ -163,10 +165,10 @@ class SubMachine:
         """ Returns the smallest and largest x and y positions for this energy layer.
         :returns: a list of four elements [min_x, max_x, min_y, max_y]
         """
-        min_x = min(self.raster_points, key=lambda x: x[0])[0]
-        min_y = min(self.raster_points, key=lambda x: x[1])[1]
-        max_x = max(self.raster_points, key=lambda x: x[0])[0]
-        max_y = max(self.raster_points, key=lambda x: x[1])[1]
+        min_x = min(self.raster_points, key=itemgetter(0))[0]
+        min_y = min(self.raster_points, key=itemgetter(1))[1]
+        max_x = max(self.raster_points, key=itemgetter(0))[0]
+        max_y = max(self.raster_points, key=itemgetter(1))[1]
         return [min_x, max_x, min_y, max_y]
 
     def get_raster_grid(self):
@@ -414,6 +414,10 @@ class TRiP98FileLocator(object):
                 self.list_of_suffixes_to_check.append(optional_dot + suffix.upper())
         self.list_of_suffixes_to_check.append("")
 
+        # paths found on the filesystem, successful lookups are not repeated by the same locator object
+        self._located_header = None
+        self._located_datafile = None
+
     @property
     def header(self):
         """
@@ -446,22 +450,9 @@ class TRiP98FileLocator(object):
 
         :return: path to the header file which exists on the filesystem or None if not found
         """
-        dir_basename = self.trip98path.dir_basename
-        files_tried = []
-        logger.info("Locating : " + self.trip98path.name + " as " + str(self.trip98path.cube_type))
-
-        for suffix in self.list_of_suffixes_to_check:
-            for gzip_extension in ("", ".gz", ".GZ"):
-                for header_extension in (self.trip98path.header_file_extension.lower(),
-                                         self.trip98path.header_file_extension.upper()):
-                    candidate_path = dir_basename + suffix + header_extension + gzip_extension
-                    if os.path.exists(candidate_path):
-                        logger.info("Found " + candidate_path)
-                        return candidate_path
-                    else:
-                        files_tried.append(candidate_path)
-        logger.warning("Checking following files: " + " , ".join(files_tried) + ". None of them exists.")
-        return None
+        if self._located_header is None:
+            self._located_header = self._locate(self.trip98path.header_file_extension)
+        return self._located_header
 
     @property
     def datafile(self):
@@ -471,15 +462,28 @@ class TRiP98FileLocator(object):
 
         :return: path to the data file which exists on the filesystem or None if not found
         """
+        if self._located_datafile is None:
+            self._located_datafile = self._locate(self.trip98path.data_file_extension)
+        return self._located_datafile
+
+    def _locate(self, extension):
+        """
+        Checks which of the candidate paths (with any of the allowed suffixes and optional .gz extension)
+        exists on the filesystem.
+
+        :param str extension: header or datafile extension (i.e. '.hed' or '.dos')
+        :return: first of the candidate paths which exists on the filesystem or None if not found
+        """
         dir_basename = self.trip98path.dir_basename
         files_tried = []
         logger.info("Locating : " + self.trip98path.name + " as " + str(self.trip98path.cube_type))
+
         for suffix in self.list_of_suffixes_to_check:
             for gzip_extension in ("", ".gz", ".GZ"):
-                for datafile_extension in (self.trip98path.data_file_extension.lower(),
-                                           self.trip98path.data_file_extension.upper()):
-                    candidate_path = dir_basename + suffix + datafile_extension + gzip_extension
+                for extension_case in (extension.lower(), extension.upper()):
+                    candidate_path = dir_basename + suffix + extension_case + gzip_extension
                     if os.path.exists(candidate_path):
+                        logger.info("Found " + candidate_path)
                         return candidate_path
                     else:
                         files_tried.append(candidate_path)
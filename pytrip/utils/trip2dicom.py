@@ -24,22 +24,67 @@ import os
 import sys
 import logging
 import argparse
+import multiprocessing
 
 import pytrip as pt
+from pytrip.util import TRiP98FilePath
 
 logger = logging.getLogger(__name__)
 
 
+def _convert(ctx_data, output_dir):
+    """ Converts a single CT cube, together with its VDX structures (if present) to DICOM files.
+
+    :param str ctx_data: location of CT file (header or data) in TRiP98 format
+    :param str output_dir: write resulting DICOM files to this directory
+    :returns: 0 on success, 1 if the CT cube could not be read
+    """
+    logger.info("Convert CT images from {:s}...".format(ctx_data))
+    c = pt.CtxCube()
+    try:
+        c.read(ctx_data)
+    except Exception as e:
+        logger.error(e)
+        return 1
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    c.write_dicom(output_dir)
+
+    ctx_dirname = os.path.dirname(ctx_data)
+    ctx_path = os.path.join(ctx_dirname, c.basename + ".vdx")
+    if os.path.exists(ctx_path):
+        logger.info("Convert VDX structures...")
+        v = pt.VdxCube(cube=c)
+        v.read(ctx_path)
+        v.write_dicom(output_dir)
+    else:
+        logger.info("No VDX data found for conversion.")
+    return 0
+
+
+def _convert_job(job):
+    """ Unpacks the (ctx_data, output_dir) tuple for _convert(), as needed by multiprocessing.Pool.map()
+    """
+    return _convert(*job)
+
+
 def main(args=sys.argv[1:]):
     """ Main function for trip2dicom.py
     """
     # parse arguments
     parser = argparse.ArgumentParser()
-    parser.add_argument("ctx_data", help="location of CT file (header or data) in TRiP98 format", type=str)
+    parser.add_argument("ctx_data", nargs="+", type=str,
+                        help="location of CT file (header or data) in TRiP98 format. If more files are given, "
+                             "each is written to a subdirectory of outputdir, named after its basename")
     parser.add_argument("outputdir", help="write resulting DICOM files to this directory", type=str)
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of files converted in parallel, 0 means one per CPU core (default: 1)")
     parser.add_argument("-v", "--verbosity", action='count', help="increase output verbosity", default=0)
     parser.add_argument('-V', '--version', action='version', version=pt.__version__)
     parsed_args = parser.parse_args(args)
+    if parsed_args.jobs < 0:
+        parser.error("argument -j/--jobs: must be 0 or a positive number, got {:d}".format(parsed_args.jobs))
 
     if parsed_args.verbosity == 1:
         logging.basicConfig(level=logging.INFO)
@@ -50,30 +95,32 @@ def main(args=sys.argv[1:]):
 
     output_dir = parsed_args.outputdir
 
-    logger.info("Convert CT images...")
-    c = pt.CtxCube()
-    try:
-        c.read(parsed_args.ctx_data)
-    except Exception as e:
-        logger.error(e)
-        return 1
-
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    c.write_dicom(output_dir)
+    if len(parsed_args.ctx_data) == 1:
+        jobs = [(parsed_args.ctx_data[0], output_dir)]
+    else:
+        basenames = [TRiP98FilePath(ctx_data, pt.CtxCube).basename for ctx_data in parsed_args.ctx_data]
+        duplicates = sorted(set(basename for basename in basenames if basenames.count(basename) > 1))
+        if duplicates:
+            # these files would be written to the same subdirectory, overwriting each other
+            logger.error("Input files with the same basename given: {:s}".format(", ".join(duplicates)))
+            return 1
+        jobs = [(ctx_data, os.path.join(output_dir, basename))
+                for ctx_data, basename in zip(parsed_args.ctx_data, basenames)]
 
-    ctx_dirname = os.path.dirname(parsed_args.ctx_data)
-    ctx_path = os.path.join(ctx_dirname, c.basename + ".vdx")
-    if os.path.exists(ctx_path):
-        logger.info("Convert VDX structures...")
-        v = pt.VdxCube(cube=c)
-        v.read(ctx_path)
-        v.write_dicom(output_dir)
+    processes = min(parsed_args.jobs or multiprocessing.cpu_count(), len(jobs))
+    if processes > 1:
+        # files are independent of each other, convert them in separate processes
+        pool = multiprocessing.Pool(processes)
+        try:
+            results = pool.map(_convert_job, jobs)
+        finally:
+            pool.close()
+            pool.join()
     else:
-        logger.info("No VDX data found for conversion.")
+        results = [_convert_job(job) for job in jobs]
 
     logger.info("Done")
-    return 0
+    return max(results)
 
 
 if __name__ == '__main__':
@@ -28,6 +28,7 @@ import glob
 import logging
 import shutil
 
+import pytrip.dicomhelper
 import pytrip.utils.trip2dicom
 import pytrip.utils.dicom2trip
 import pytrip.utils.cubeslice
@@ -56,6 +57,56 @@ class TestTrip2Dicom(unittest.TestCase):
         # check if destination directory is not empty
         self.assertTrue(os.listdir(tmpdir))
 
+        # read back only metadata of generated DICOM files
+        dcm = pytrip.dicomhelper.read_dicom_dir(tmpdir, stop_before_pixels=True)
+        self.assertEqual(len(dcm["images"]), 300)
+        self.assertNotIn("PixelData", dcm["images"][0])
+
+        shutil.rmtree(tmpdir)
+
+    def test_generate_many(self):
+        # create temp dir with two copies of the CT cube and its structures
+        tmpdir = tempfile.mkdtemp()
+        for basename in ("patient1", "patient2"):
+            for extension in (".hed", ".ctx.gz", ".vdx"):
+                shutil.copy(self.cube000 + extension, os.path.join(tmpdir, basename + extension))
+        outdir = os.path.join(tmpdir, "out")
+
+        # convert both cubes in parallel, each one into its own subdirectory
+        ret_code = pytrip.utils.trip2dicom.main([os.path.join(tmpdir, "patient1"),
+                                                 os.path.join(tmpdir, "patient2"),
+                                                 outdir, "--jobs", "2"])
+        self.assertEqual(ret_code, 0)
+        for basename in ("patient1", "patient2"):
+            self.assertIn("RTSTRUCT.PYTRIP.dcm", os.listdir(os.path.join(outdir, basename)))
+
+        shutil.rmtree(tmpdir)
+
+    def test_generate_many_same_basename(self):
+        # two cubes with the same basename would overwrite each other in outdir
+        tmpdir = tempfile.mkdtemp()
+        for dirname in ("dir1", "dir2"):
+            os.mkdir(os.path.join(tmpdir, dirname))
+            for extension in (".hed", ".ctx.gz"):
+                shutil.copy(self.cube000 + extension, os.path.join(tmpdir, dirname, "patient" + extension))
+        outdir = os.path.join(tmpdir, "out")
+
+        ret_code = pytrip.utils.trip2dicom.main([os.path.join(tmpdir, "dir1", "patient"),
+                                                 os.path.join(tmpdir, "dir2", "patient"),
+                                                 outdir])
+        self.assertEqual(ret_code, 1)
+        self.assertFalse(os.path.exists(outdir))
+
+        shutil.rmtree(tmpdir)
+
+    def test_negative_jobs(self):
+        try:
+            pytrip.utils.trip2dicom.main([self.cube000, tempfile.gettempdir(), "--jobs", "-1"])
+        except SystemExit as e:
+            self.assertEqual(e.code, 2)
+        else:
+            self.fail("negative number of jobs accepted")
+
     def test_version(self):
         try:
             pytrip.utils.trip2dicom.main(["--version"])
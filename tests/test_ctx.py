@@ -22,10 +22,13 @@ TODO: documentation here.
 import gzip
 import hashlib
 import os
+import shutil
 import tempfile
 import unittest
 import logging
 
+import numpy as np
+
 import tests.base
 from pytrip.ctx import CtxCube
 from pytrip.error import FileNotFound
@@ -112,6 +115,50 @@ class TestCtx(unittest.TestCase):
             logger.info("Catching {:s}".format(str(e)))
             self.read_and_write_cube(self.cube000 + ".vdx")
 
+    def test_creation_info(self):
+        c = CtxCube()
+        c.create_empty_cube(0, 4, 3, 2, pixel_size=1.0, slice_distance=1.0)
+        c.version = "2.0"
+        outdir = tempfile.mkdtemp()
+
+        # values with spaces, and empty values, as written by pytrip itself
+        for created_by, creation_info in (("John  Doe", "Created with PyTRiP98 1.0"), ("", "")):
+            c.created_by = created_by
+            c.creation_info = creation_info
+            c.write(os.path.join(outdir, "patient"))
+
+            d = CtxCube()
+            d.read(os.path.join(outdir, "patient"))
+            self.assertEqual(d.created_by, created_by)
+            self.assertEqual(d.creation_info, creation_info)
+
+        # keyword without a value
+        d = CtxCube()
+        d._parse_trip_header("created_by\ncreation_info\ndata_type integer\nnum_bytes 2\nbyte_order vms\n"
+                             "pixel_size 1.0\nslice_distance 1.0\nslice_number 1\nxoffset 0\nyoffset 0\nzoffset 0\n")
+        self.assertEqual(d.created_by, "")
+        self.assertEqual(d.creation_info, "")
+
+        shutil.rmtree(outdir)
+
+    def test_write_version(self):
+        c = CtxCube()
+        c.create_empty_cube(0, 4, 3, 2, pixel_size=1.0, slice_distance=1.0)
+        outdir = tempfile.mkdtemp()
+
+        # created_by is written only for files of version 1.4 or newer, also for non-numeric versions
+        for version, has_created_by in (("1.2", False), ("1.4a", True), ("2.0", True), ("unknown", True)):
+            c.version = version
+            header_path, _ = c.write(os.path.join(outdir, "patient"))
+            with open(header_path) as f:
+                self.assertEqual("created_by" in f.read(), has_created_by)
+
+            d = CtxCube()
+            d.read(header_path)
+            self.assertEqual(d.version, version)
+
+        shutil.rmtree(outdir)
+
     def test_addition(self):
         # read cube
         c = CtxCube()
@@ -119,6 +166,118 @@ class TestCtx(unittest.TestCase):
         d = c + 5
         self.assertEqual(c.cube[10][20][30] + 5, d.cube[10][20][30])
 
+        # data type of the cube is kept when adding or multiplying by a number
+        self.assertEqual(d.cube.dtype, c.cube.dtype)
+        e = c * 2.0
+        self.assertEqual(e.cube.dtype, c.cube.dtype)
+        self.assertEqual(c.cube[10][20][30] * 2, e.cube[10][20][30])
+
+    def test_set_data_type(self):
+        c = CtxCube()
+        for data_type, expected in ((np.int16, ("integer", 2)),
+                                    (np.float32, ("float", 4)),
+                                    (np.float64, ("double", 8))):
+            c.set_data_type(data_type)
+            self.assertEqual((c.data_type, c.num_bytes), expected)
+
+        # unsupported types leave the header unchanged
+        c.set_data_type(np.int64)
+        self.assertEqual((c.data_type, c.num_bytes), ("double", 8))
+
+    def test_division(self):
+        c = CtxCube()
+        c.create_empty_cube(6, 4, 3, 2, pixel_size=1.0, slice_distance=1.0)
+        d = CtxCube(c)
+        d.cube[:] = 4
+        d.cube[0, 0, :] = 0
+
+        # dividing two cubes gives floating point numbers, voxels with a zero divisor are set to zero
+        e = c / d
+        self.assertEqual(e.cube.dtype.kind, 'f')
+        self.assertTrue(np.all(e.cube[0, 0, :] == 0))
+        self.assertTrue(np.all(e.cube[1] == 1.5))
+
+        # dividing by a number keeps the data type of the cube, division by zero gives a zero cube
+        e = c / 4
+        self.assertEqual(e.cube.dtype, c.cube.dtype)
+        self.assertTrue(np.all(e.cube == 1))
+        e = c / 0
+        self.assertTrue(np.all(e.cube == 0))
+
+    def test_addition_float_data(self):
+        # cube with an integer header, holding floating point data
+        c = CtxCube()
+        c.create_empty_cube(0, 4, 3, 2, pixel_size=1.0, slice_distance=1.0)
+        c.cube = np.full(c.cube.shape, 1.05, dtype=np.float32)
+
+        # fraction is not lost
+        d = c + 0.1
+        self.assertEqual(d.cube.dtype, np.float32)
+        self.assertTrue(np.allclose(d.cube, 1.15))
+        d = c - 0.1
+        self.assertEqual(d.cube.dtype, np.float32)
+        self.assertTrue(np.allclose(d.cube, 0.95))
+        d = c * 2.0
+        self.assertEqual(d.cube.dtype, np.float32)
+        self.assertTrue(np.allclose(d.cube, 2.1))
+        d = c / 2.0
+        self.assertEqual(d.cube.dtype, np.float32)
+        self.assertTrue(np.allclose(d.cube, 0.525))
+        d = c / 0
+        self.assertEqual(d.cube.dtype, np.float32)
+        self.assertTrue(np.all(d.cube == 0))
+
+        # values beyond the int16 range of the header do not overflow
+        c.cube = np.full(c.cube.shape, 40760.0)
+        d = c + 0.5
+        self.assertEqual(d.cube.dtype, np.float64)
+        self.assertTrue(np.all(d.cube == 40760.5))
+
+
+class RowsVoi(object):
+    """ Stand-in for a Voi, returning fixed contour intersections for each row along x.
+    """
+    def __init__(self, intersections):
+        self.intersections = intersections  # sorted x positions [mm], keyed by row index i_y
+
+    def get_row_intersections(self, pos):
+        return np.array(self.intersections.get(int(pos[1]), []))
+
+
+class TestVoiMask(unittest.TestCase):
+    def setUp(self):
+        # 8 x 4 x 1 cube, voxel centres at x = 0.5, 1.5, ..., 7.5 mm
+        self.c = CtxCube()
+        self.c.create_empty_cube(1, 8, 4, 1, pixel_size=1.0, slice_distance=1.0)
+        self.voi = RowsVoi({
+            0: [0.2, 2.8, 4.2, 6.8],  # row crossing two disjoint contours
+            1: [1.5, 4.5],  # intersections exactly at voxel centres
+            2: [3.1, 3.4, 5.4, 5.6],  # contours narrower than one voxel, only the second one covers a centre
+        })
+        self.expected = np.zeros((1, 4, 8), dtype=bool)
+        self.expected[0, 0, [0, 1, 2, 4, 5, 6]] = True
+        self.expected[0, 1, [2, 3, 4]] = True
+        self.expected[0, 2, 5] = True
+
+    def test_compute_voi_mask(self):
+        mask = self.c._compute_voi_mask(self.voi)
+        self.assertEqual(mask.dtype, bool)
+        self.assertTrue(np.array_equal(mask, self.expected))
+
+    def test_mask_by_voi(self):
+        self.c.mask_by_voi(self.voi, 5)
+        self.c.mask_by_voi(self.voi, 5)
+        self.assertTrue(np.array_equal(self.c.cube, np.where(self.expected, 5, 1)))
+
+    def test_mask_by_voi_add(self):
+        self.c.mask_by_voi_add(self.voi, 5)
+        self.c.mask_by_voi_add(self.voi, 5)
+        self.assertTrue(np.array_equal(self.c.cube, np.where(self.expected, 11, 1)))
+
+    def test_mask_by_voi_all(self):
+        self.c.mask_by_voi_all(self.voi, preset=3)
+        self.assertTrue(np.array_equal(self.c.cube, np.where(self.expected, 3, 0)))
+
 
 if __name__ == '__main__':
     unittest.main()
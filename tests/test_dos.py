@@ -157,6 +157,38 @@ class TestDos(unittest.TestCase):
         os.remove(hed_file)
         os.remove(dos_file)
 
+    def test_write_gz(self):
+        c = DosCube()
+        c.read(self.cube000)
+
+        outdir = tempfile.mkdtemp()
+        hed_file = os.path.join(outdir, "foobar" + DosCube.header_file_extension + ".gz")
+        dos_file = os.path.join(outdir, "foobar" + DosCube.data_file_extension + ".gz")
+        c.write((hed_file, dos_file))
+        self.assertGreater(os.path.getsize(dos_file), 1)
+        self.assertLess(os.path.getsize(dos_file), c.cube.nbytes)
+
+        d = DosCube()
+        d.read((hed_file, dos_file))
+        self.assertEqual(d.patient_name, "foobar")
+        self.assertTrue(np.array_equal(d.cube, c.cube))
+        shutil.rmtree(outdir)
+
+    def test_read_dicom_non_square(self):
+        class FakeDose(object):
+            pixel_array = np.arange(24, dtype=np.uint16).reshape(2, 3, 4)
+
+        c = DosCube()
+        c.create_empty_cube(0, 4, 3, 2, pixel_size=1.0, slice_distance=1.0)
+        c.header_set = True  # keep dimensions of the empty cube
+        c.read_dicom({"rtdose": FakeDose()})
+        self.assertEqual(c.cube.shape, (2, 3, 4))
+        self.assertTrue(np.array_equal(c.cube, FakeDose.pixel_array))
+
+        # frames with rows and columns swapped don't fit the cube
+        FakeDose.pixel_array = FakeDose.pixel_array.reshape(2, 4, 3)
+        self.assertRaises(ValueError, c.read_dicom, {"rtdose": FakeDose()})
+
 
 if __name__ == '__main__':
     unittest.main()